@@ -18,16 +18,40 @@ Usage:
     obj = loads(s)
 """
 
+from array import array
 from dataclasses import is_dataclass, asdict
+import functools
 import json
+from json.encoder import encode_basestring as _json_quote  # == json.dumps(s, ensure_ascii=False)
 import inspect
+import re
+import string
 from typing import Any, List, Tuple, Dict
 
 INDENT_STR = "  "  # two spaces per level (modifiable if desired)
 
+# one match per line: leading indentation and the rest of the line (rstripped by loads)
+_LINE_RE = re.compile(r"^( *)([^\n]*)$", re.M)
+# one match per comma-separated token; quoted tokens may contain commas and escapes
+# (the unquoted alternative is greedy: a lazy one backtracks quadratically on space runs)
+_CSV_RE = re.compile(r"""\s*("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^,]*)\s*(?:,|$)""")
+# strings matching this (separators, leading quote, edge whitespace) must be quoted
+_QUOTE_RE = re.compile(r"""[,\n\r]|^[\s"']|\s$""")
+_RESERVED = frozenset(("null", "true", "false"))
+
 
 # -------------------- Helpers for serialization --------------------
 
+def _pad(n: int) -> str:
+    """Return the indentation string for level n (follows changes to INDENT_STR)."""
+    return _pad_cached(INDENT_STR, n)
+
+
+@functools.lru_cache(maxsize=256)
+def _pad_cached(indent_str: str, n: int) -> str:
+    # keyed on the indent string too, so reassigning INDENT_STR never serves stale pads
+    return indent_str * n
+
 
 def _is_primitive(x):
     return x is None or isinstance(x, (bool, int, float, str))
@@ -42,25 +66,46 @@ def _to_toon_primitive(x):
     if isinstance(x, (int, float)):
         return str(x)
     s = str(x)
+    # only short (enum/label-like) values are memoized: the cache must not keep
+    # large caller payloads alive after dumps() returns
+    if len(s) <= _QUOTE_CACHE_MAX_LEN:
+        return _quote_str_cached(s)
+    return _quote_str(s)
+
+
+def _quote_str(s: str) -> str:
+    """Quote a string value if it would otherwise be ambiguous."""
     if s == "":
         return '""'
-    needs_quote = (
-        any(ch in s for ch in [",", "\n", "\r"])
-        or s[0].isspace()
-        or s[-1].isspace()
-        or s.startswith(('"', "'"))
-        or s.lower() in ("null", "true", "false")
-    )
+    needs_quote = bool(_QUOTE_RE.search(s)) or s.lower() in _RESERVED
     if needs_quote:
-        return json.dumps(s, ensure_ascii=False)
+        return _json_quote(s)
     return s
 
 
+_QUOTE_CACHE_MAX_LEN = 64
+_quote_str_cached = functools.lru_cache(maxsize=4096)(_quote_str)
+
+
 def _escape_header_key(k: str) -> str:
     """Make a key safe for header usage; quote if it's not a simple identifier."""
+    if type(k) is str:
+        return _escape_str_key_cached(k)
     if isinstance(k, str) and k.isidentifier():
         return k
-    return json.dumps(str(k), ensure_ascii=False)
+    return _json_quote(str(k))
+
+
+@functools.lru_cache(maxsize=1024)
+def _escape_str_key_cached(k: str) -> str:
+    """
+    _escape_header_key for plain str keys, memoized since field names repeat constantly.
+    Only exact str is cached: equal keys of other types (1 / True, (1,) / (True,)) would
+    share a cache slot but stringify differently.
+    """
+    if k.isidentifier():
+        return k
+    return _json_quote(k)
 
 
 def _is_namedtuple_instance(x):
@@ -83,24 +128,64 @@ def _object_to_dict(obj):
     return {"value": repr(obj)}
 
 
-def _all_dicts_uniform(list_of_dicts: List[dict]) -> Tuple[bool, List[str] or None]:
+# list layouts chosen by _classify
+_LIST_TABLE = "table"
+_LIST_PRIMITIVES = "primitives"
+_LIST_MIXED = "mixed"
+
+
+def _classify(lst) -> Tuple[str, Any]:
+    """
+    Decide in a single pass how a non-empty list is emitted; returns (kind, keys).
+    _LIST_TABLE: every item is a dict with the same non-empty key set and only primitive
+    values; keys is their shared insertion order, or the sorted keys if orders differ.
+    _LIST_PRIMITIVES: every item is a primitive. _LIST_MIXED: anything else.
     """
-    Return (is_uniform, keys_order).
-    Uniform means every element is a dict and they all have the same set of keys.
-    If insertion order is consistent across elements, return that order; otherwise return sorted keys.
+    first = lst[0]
+    if not isinstance(first, dict):
+        for x in lst:
+            if not _is_primitive(x):
+                return _LIST_MIXED, None
+        return _LIST_PRIMITIVES, None
+
+    keys = tuple(first)
+    if not keys:
+        return _LIST_MIXED, None
+    key_set = None  # only built once some dict's key order differs from the first
+    for d in lst:
+        if not isinstance(d, dict):
+            return _LIST_MIXED, None
+        if key_set is None:
+            if tuple(d) != keys:
+                key_set = set(keys)
+                if d.keys() != key_set:
+                    return _LIST_MIXED, None
+        elif d.keys() != key_set:
+            return _LIST_MIXED, None
+        for v in d.values():
+            if not _is_primitive(v):
+                return _LIST_MIXED, None
+    if key_set is None:
+        return _LIST_TABLE, keys
+    return _LIST_TABLE, tuple(sorted(key_set))
+
+
+@functools.lru_cache(maxsize=256)
+def _make_row_emitter(keys: Tuple[Any, ...]):
     """
-    if not list_of_dicts:
-        return False, None
-    if not all(isinstance(item, dict) for item in list_of_dicts):
-        return False, None
-    sets = [set(d.keys()) for d in list_of_dicts]
-    first_set = sets[0]
-    if all(s == first_set for s in sets):
-        first_keys = list(list_of_dicts[0].keys())
-        if all(tuple(d.keys()) == tuple(first_keys) for d in list_of_dicts):
-            return True, first_keys
-        return True, sorted(first_set)
-    return False, None
+    Compile a row formatter specialized for one table shape: emit(d, pad) returns the
+    newline-terminated row line, with one inlined lookup + quote per column and no loop.
+    Keys are bound as names in the function's globals, so any hashable key works.
+    """
+    ns: Dict[str, Any] = {"_q": _to_toon_primitive}
+    cells = []
+    for i, k in enumerate(keys):
+        ns[f"_k{i}"] = k
+        cells.append(f"{{_q(d[_k{i}])}}")
+    # _q is bound as a default so each cell call is a local load, not a globals lookup
+    src = 'def emit(d, p, _q=_q):\n    return f"{p}' + ",".join(cells) + '\\n"\n'
+    exec(src, ns)
+    return ns["emit"]
 
 
 # -------------------- Serialization: dumps --------------------
@@ -111,14 +196,26 @@ def dumps(obj: Any, name: str = None, indent: int = 0) -> str:
     Serialize Python object into TOON. `name` is optional and produces a top-level key.
     indent counts indentation levels (0 == top).
     """
-    pad = INDENT_STR * indent
+    out: List[str] = []
+    _dump(obj, name, indent, out)
+    return "".join(out)
+
+
+def _dump(obj: Any, name: str, indent: int, out: List[str]) -> None:
+    """
+    Append the TOON lines for `obj` to `out`. Every chunk ends with a newline, so the
+    caller only ever concatenates; nothing is built and re-split along the way.
+    """
+    pad = _pad(indent)
 
     # primitives
     if _is_primitive(obj):
         val = _to_toon_primitive(obj)
         if name:
-            return f"{pad}{name}: {val}\n"
-        return f"{pad}{val}\n"
+            out.append(f"{pad}{name}: {val}\n")
+        else:
+            out.append(f"{pad}{val}\n")
+        return
 
     # dataclass / namedtuple => dict
     if _is_namedtuple_instance(obj) or is_dataclass(obj):
@@ -126,76 +223,71 @@ def dumps(obj: Any, name: str = None, indent: int = 0) -> str:
 
     # dict
     if isinstance(obj, dict):
-        lines = []
         if name:
-            lines.append(f"{pad}{name}:")
-            child_pad = INDENT_STR * (indent + 1)
+            out.append(f"{pad}{name}:\n")
+            child_pad = _pad(indent + 1)
         else:
             child_pad = pad
-        # explicit empty dict representation: return a '{}' line so parser can detect it
+        # explicit empty dict representation: emit a '{}' line so parser can detect it
         if not obj:
-            if name:
-                return f"{pad}{name}:\n{child_pad}{{}}\n"
-            return f"{pad}{{}}\n"
+            out.append(f"{child_pad}{{}}\n" if name else f"{pad}{{}}\n")
+            return
         for k, v in obj.items():
             key = _escape_header_key(k)
             if _is_primitive(v):
-                lines.append(f"{child_pad}{key}: {_to_toon_primitive(v)}")
+                out.append(f"{child_pad}{key}: {_to_toon_primitive(v)}\n")
             else:
-                lines.append(f"{child_pad}{key}:")
+                out.append(f"{child_pad}{key}:\n")
                 # use one-level deeper indentation for nested content
-                lines.append(dumps(v, name=None, indent=indent + 1).rstrip("\n"))
-        return "\n".join(lines) + ("\n" if lines else "")
+                _dump(v, None, indent + 1, out)
+        return
 
-    # list / tuple / set
-    if isinstance(obj, (list, tuple, set)):
-        if isinstance(obj, set):
+    # list / tuple / set / frozenset
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        if isinstance(obj, (set, frozenset)):
             try:
-                lst = sorted(list(obj))
-            except Exception:
-                lst = list(obj)
+                lst = sorted(obj)
+            except TypeError:
+                # mixed, unorderable element types: still emit in a stable order
+                lst = sorted(obj, key=repr)
         else:
-            lst = list(obj)
+            # lists/tuples are only read below, so use them as-is rather than copying
+            lst = obj
         n = len(lst)
         if n == 0:
-            return f"{pad}{name}[0]:\n" if name else f"{pad}[]\n"
+            out.append(f"{pad}{name}[0]:\n" if name else f"{pad}[]\n")
+            return
 
-        uniform, keys = _all_dicts_uniform(lst)
+        kind, keys = _classify(lst)
         # compact table if uniform dicts and all primitive values
-        if (
-            uniform
-            and keys
-            and all(
-                _is_primitive(v)
-                for d in lst
-                for v in (d.values() if isinstance(d, dict) else [])
-            )
-        ):
-            keys_escaped = ",".join(_escape_header_key(k) for k in keys)
+        if kind == _LIST_TABLE:
+            keys_escaped = ",".join(map(_escape_header_key, keys))
             header = (
-                f"{pad}{name}[{n}]{{{keys_escaped}}}:"
+                f"{pad}{name}[{n}]{{{keys_escaped}}}:\n"
                 if name
-                else f"{pad}[{n}]{{{keys_escaped}}}:"
+                else f"{pad}[{n}]{{{keys_escaped}}}:\n"
             )
-            lines = [header]
+            out.append(header)
+            row_pad = _pad(indent + 1)
+            emit = _make_row_emitter(keys)
             for d in lst:
-                row = ",".join(_to_toon_primitive(d.get(k)) for k in keys)
-                lines.append(f"{pad}{INDENT_STR}{row}")
-            return "\n".join(lines) + "\n"
+                out.append(emit(d, row_pad))
+            return
 
         # all primitives => single-line comma list (if named) or a simple "- ..." block
-        if all(_is_primitive(x) for x in lst):
-            vals = ",".join(_to_toon_primitive(x) for x in lst)
+        if kind == _LIST_PRIMITIVES:
+            parts = [_to_toon_primitive(x) for x in lst]
             if name:
-                return f"{pad}{name}[{n}]: {vals}\n"
-            # unnamed list of primitives as a single "- ..." line (useful for readability)
-            return f"{pad}- " + ", ".join(_to_toon_primitive(x) for x in lst) + "\n"
+                out.append(f"{pad}{name}[{n}]: {','.join(parts)}\n")
+            else:
+                # unnamed list of primitives as a single "- ..." line (useful for readability)
+                out.append(f"{pad}- {', '.join(parts)}\n")
+            return
 
         # mixed/complex items => list block with '-' markers; nested items are indented one level deeper
-        lines = []
         if name:
-            lines.append(f"{pad}{name}[{n}]:")
-            item_indent_str = pad + INDENT_STR
+            out.append(f"{pad}{name}[{n}]:\n")
+            item_indent_str = _pad(indent + 1)
             nested_indent = indent + 2
         else:
             item_indent_str = pad
@@ -203,68 +295,91 @@ def dumps(obj: Any, name: str = None, indent: int = 0) -> str:
 
         for item in lst:
             if _is_primitive(item):
-                lines.append(f"{item_indent_str}- {_to_toon_primitive(item)}")
+                out.append(f"{item_indent_str}- {_to_toon_primitive(item)}\n")
             else:
                 # migrate dataclass/namedtuple -> dict first
                 if _is_namedtuple_instance(item) or is_dataclass(item):
                     item = _object_to_dict(item)
                 # list item header
-                lines.append(f"{item_indent_str}-")
+                out.append(f"{item_indent_str}-\n")
                 # nested item content at indent+2 (one level deeper than the '-' line)
-                lines.append(dumps(item, name=None, indent=nested_indent).rstrip("\n"))
-        return "\n".join(lines) + "\n"
+                _dump(item, None, nested_indent, out)
+        return
 
     # fallback for objects: try to convert to dict and include class name
+    mark = len(out)
     try:
         obj_dict = _object_to_dict(obj)
-        return dumps(obj_dict, name=name, indent=indent)
+        _dump(obj_dict, name, indent, out)
     except Exception:
+        # drop anything the failed attempt already wrote
+        del out[mark:]
         val = _to_toon_primitive(repr(obj))
         if name:
-            return f"{pad}{name}: {val}\n"
-        return f"{pad}{val}\n"
+            out.append(f"{pad}{name}: {val}\n")
+        else:
+            out.append(f"{pad}{val}\n")
 
 
 # -------------------- Parsing: loads --------------------
 
 
-def _parse_primitive_token(tok: str):
-    tok = tok.strip()
-    if tok == "":
-        return ""
-    if tok == "null":
-        return None
-    if tok == "true":
-        return True
-    if tok == "false":
-        return False
-    # JSON quoted string
-    if (tok.startswith('"') and tok.endswith('"')) or (
-        tok.startswith("'") and tok.endswith("'")
-    ):
-        try:
-            return json.loads(tok)
-        except Exception:
-            return tok[1:-1]
+def _p_number_or_str(tok: str):
     # try int then float (float handles nan/inf and exponent forms)
     try:
-        # attempt exact int parsing first
-        try:
-            return int(tok)
-        except Exception:
-            # fall back to float parsing (accepts 'nan', 'inf', '1e3', etc.)
-            return float(tok)
-    except Exception:
+        return int(tok)
+    except ValueError:
+        pass
+    try:
+        # fall back to float parsing (accepts 'nan', 'inf', '1e3', etc.)
+        return float(tok)
+    except ValueError:
         return tok
 
 
-def _count_leading_indent(s: str) -> int:
-    """Count how many INDENT_STR are at the start of s."""
-    count = 0
-    while s.startswith(INDENT_STR):
-        count += 1
-        s = s[len(INDENT_STR) :]
-    return count
+def _p_str(tok: str):
+    return tok
+
+
+def _p_null(tok: str):
+    return None if tok == "null" else _p_number_or_str(tok)  # 'nan' also starts with n
+
+
+def _p_true(tok: str):
+    return True if tok == "true" else tok
+
+
+def _p_false(tok: str):
+    return False if tok == "false" else tok
+
+
+def _p_quoted(tok: str):
+    # JSON quoted string
+    if not tok.endswith(tok[0]):
+        return _p_number_or_str(tok)
+    try:
+        return json.loads(tok)
+    except ValueError:
+        return tok[1:-1]
+
+
+# token parser by first character. ASCII letters can only start a number as
+# inf/infinity/nan (i, I, n, N), so every other letter goes straight to str;
+# anything not listed (digits, signs, '.', non-ASCII) tries int/float first.
+_DISPATCH = dict.fromkeys(
+    (c for c in string.ascii_letters if c not in "iInN"), _p_str
+)
+_DISPATCH.update({"n": _p_null, "t": _p_true, "f": _p_false, '"': _p_quoted, "'": _p_quoted})
+
+
+def _parse_primitive_token(tok: str):
+    tok = tok.strip()
+    if not tok:
+        return ""
+    fn = _DISPATCH.get(tok[0])
+    if fn is not None:
+        return fn(tok)
+    return _p_number_or_str(tok)
 
 
 def _split_csv_like(s: str) -> List[str]:
@@ -272,32 +387,23 @@ def _split_csv_like(s: str) -> List[str]:
     Split comma-separated tokens but respect quoted substrings.
     Returns list of tokens (whitespace preserved trimmed).
     """
-    parts = []
-    cur = ""
-    in_q = False
-    qchar = None
-    i = 0
-    while i < len(s):
-        ch = s[i]
-        if ch in ('"', "'"):
-            if not in_q:
-                in_q = True
-                qchar = ch
-                cur += ch
-            elif qchar == ch:
-                in_q = False
-                cur += ch
-            else:
-                cur += ch
-        elif ch == "," and not in_q:
-            parts.append(cur.strip())
-            cur = ""
-        else:
-            cur += ch
-        i += 1
-    if cur.strip() != "":
-        parts.append(cur.strip())
-    return parts
+    n = len(s)
+    return [
+        m.group(1).rstrip() for m in _CSV_RE.finditer(s) if m.group(1) or m.end() < n
+    ]
+
+
+def _parse_table_rows(
+    contents: List[str], start: int, end: int, keys: List[str]
+) -> List[dict]:
+    """Parse the table rows contents[start:end] into dicts keyed by the header `keys`."""
+    split = _split_csv_like
+    parse = _parse_primitive_token
+    # one C-level dict construction per row instead of a per-cell row[k] = ... store
+    return [
+        dict(zip(keys, [parse(vtok) for vtok in split(contents[i])]))
+        for i in range(start, end)
+    ]
 
 
 def loads(toon_str: str) -> Any:
@@ -305,49 +411,46 @@ def loads(toon_str: str) -> Any:
     Parse a TOON string (created by dumps) back into Python objects (dict/list/primitives).
     This parser is intentionally aligned to the dumps() format above for reliable round-trips.
     """
-    # Split and filter out blank lines but preserve structural indentation
-    raw_lines = toon_str.splitlines()
-    lines = []
-    for ln in raw_lines:
-        # keep lines that are not empty after stripping spaces (but preserve indentation)
-        if ln.strip() == "":
-            continue
-        lines.append(ln.rstrip("\n"))
-
-    # Preprocess into (indent_level, content) tuples
-    processed: List[Tuple[int, str]] = []
-    for ln in lines:
-        indent = _count_leading_indent(ln)
-        content = ln[indent * len(INDENT_STR) :]
-        processed.append((indent, content))
-
+    # Preprocess into parallel indent_level / content lists, skipping blank lines
+    width = len(INDENT_STR)
+    indents = array("i")  # compact machine ints, no per-line tuple or int object
+    contents: List[str] = []
+    for m in _LINE_RE.finditer(toon_str):
+        content = m.group(2).rstrip()
+        if content:
+            indents.append(len(m.group(1)) // width)
+            contents.append(content)
+
+    # Blocks are parsed iteratively rather than by recursion. The block being parsed lives
+    # in expected_indent / result / arr_mode; opening a nested block pushes those onto
+    # `stack` along with `slot`, which says where the nested value goes when it ends:
+    # None appends it to the parent's list, (key, is_list_header) stores it under key.
     idx = 0
-    N = len(processed)
-
-    def parse_block(expected_indent: int):
-        nonlocal idx
-        result: Dict[str, Any] = {}
-        arr_mode = None  # if we encounter '-' list items, we build a list
-
-        while idx < N:
-            indent, content = processed[idx]
-            if indent < expected_indent:
-                break
-            if indent > expected_indent:
-                # Deeper indentation than expected: this should be consumed by caller.
-                break
+    N = len(contents)
+    expected_indent = 0
+    result: Dict[str, Any] = {}
+    arr_mode = None  # if we encounter '-' list items, we build a list
+    slot = None
+    stack: List[Tuple[int, Dict[str, Any], Any, Any]] = []
+
+    while True:
+        # Lines deeper or shallower than expected end the block (the caller consumes them).
+        while idx < N and indents[idx] == expected_indent:
+            content = contents[idx]
 
             # Handle explicit empty list "[]"
             if content.strip() == "[]":
                 idx += 1
                 if arr_mode is None and not result:
-                    return []
+                    value = []
+                    break
                 continue
             # Handle explicit empty dict "{}"
             if content.strip() == "{}":
                 idx += 1
                 if arr_mode is None and not result:
-                    return {}
+                    value = {}
+                    break
                 continue
 
             # Handle list item lines: "- value" or "-" (then nested)
@@ -358,9 +461,10 @@ def loads(toon_str: str) -> Any:
                 idx += 1
                 if content == "-":
                     # nested block follows with indent > current indent
-                    if idx < N and processed[idx][0] > indent:
-                        item = parse_block(indent + 1)
-                        arr_mode.append(item)
+                    if idx < N and indents[idx] > expected_indent:
+                        stack.append((expected_indent, result, arr_mode, slot))
+                        expected_indent += 1
+                        result, arr_mode, slot = {}, None, None
                     else:
                         arr_mode.append(None)
                 else:
@@ -379,25 +483,35 @@ def loads(toon_str: str) -> Any:
             # otherwise handle "key: value" or "key:" or "name[N]{...}:" or "name[N]: v1,v2" forms
             # find colon not inside quotes
             colon_pos = None
-            in_q = False
-            qch = None
-            for i, ch in enumerate(content):
-                if ch in ('"', "'"):
-                    if not in_q:
-                        in_q = True
-                        qch = ch
-                    elif qch == ch:
-                        in_q = False
-                if ch == ":" and not in_q:
-                    colon_pos = i
-                    break
+            cpos = content.find(":")
+            if (
+                cpos != -1
+                and content.find('"', 0, cpos) == -1
+                and content.find("'", 0, cpos) == -1
+            ):
+                # no quote before the first colon (the usual case): it is the separator
+                colon_pos = cpos
+            elif cpos != -1:
+                in_q = False
+                qch = None
+                for i, ch in enumerate(content):
+                    if ch in ('"', "'"):
+                        if not in_q:
+                            in_q = True
+                            qch = ch
+                        elif qch == ch:
+                            in_q = False
+                    if ch == ":" and not in_q:
+                        colon_pos = i
+                        break
 
             if colon_pos is None:
                 # No key: treat as a primitive-only line (top-level primitive or inline primitive)
                 val = _parse_primitive_token(content)
                 idx += 1
                 if arr_mode is None and not result:
-                    return val
+                    value = val
+                    break
                 if arr_mode is not None:
                     arr_mode.append(val)
                     continue
@@ -435,15 +549,10 @@ def loads(toon_str: str) -> Any:
                     except Exception:
                         keys = []
                     # collect rows at indent == expected_indent + 1
-                    rows = []
-                    while idx < N and processed[idx][0] == expected_indent + 1:
-                        _, row_content = processed[idx]
-                        parts = _split_csv_like(row_content.strip())
-                        row = {}
-                        for k, vtok in zip(keys, parts):
-                            row[k] = _parse_primitive_token(vtok)
-                        rows.append(row)
+                    start = idx
+                    while idx < N and indents[idx] == expected_indent + 1:
                         idx += 1
+                    rows = _parse_table_rows(contents, start, idx, keys)
                     if name_section == "":
                         # anonymous table -> return as list? put under special key
                         # but to be consistent, put under "_table" with rows
@@ -466,12 +575,9 @@ def loads(toon_str: str) -> Any:
                             pass
 
                     # nested block "key:" -> parse a nested block at indent+1
-                    nested = parse_block(expected_indent + 1)
-
-                    if is_list_header and nested == {}:
-                        nested = []
-
-                    result[real_key] = nested
+                    stack.append((expected_indent, result, arr_mode, slot))
+                    expected_indent += 1
+                    result, arr_mode, slot = {}, None, (real_key, is_list_header)
                     continue
             else:
                 # inline value exists after colon.
@@ -486,19 +592,27 @@ def loads(toon_str: str) -> Any:
                 result[key_part] = _parse_primitive_token(val_part)
                 continue
 
-        if arr_mode is not None:
-            return arr_mode
-
-        # Unwrap anonymous table if it's the only thing
-        if len(result) == 1 and "_table" in result:
-            return result["_table"]
-
-        return result
-
-    # Start parse from top-level indent 0
-    idx = 0
-    parsed = parse_block(0)
-    return parsed
+        else:
+            if arr_mode is not None:
+                value = arr_mode
+            # Unwrap anonymous table if it's the only thing
+            elif len(result) == 1 and "_table" in result:
+                value = result["_table"]
+            else:
+                value = result
+
+        # block finished: hand its value to the enclosing block, or return it at top level
+        if not stack:
+            return value
+        child_slot = slot
+        expected_indent, result, arr_mode, slot = stack.pop()
+        if child_slot is None:
+            arr_mode.append(value)
+        else:
+            real_key, is_list_header = child_slot
+            if is_list_header and value == {}:
+                value = []
+            result[real_key] = value
 
 
 # -------------------- Quick demo when run as script --------------------
@@ -1,4 +1,6 @@
 import math
+import sys
+import pytest
 from pytoon import toon as toon_mod
 
 
@@ -31,3 +33,68 @@ def test_deeply_nested():
     s = toon_mod.dumps(root)
     parsed = toon_mod.loads(s)
     assert isinstance(parsed, dict)
+
+
+def test_loads_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    s = "".join(f"{'  ' * i}lvl{i}:\n" for i in range(depth)) + f"{'  ' * depth}leaf: 1\n"
+    parsed = toon_mod.loads(s)
+    for i in range(depth):
+        parsed = parsed[f"lvl{i}"]
+    assert parsed == {"leaf": 1}
+
+
+@pytest.mark.parametrize("row,expected", [
+    ("1,A", ["1", "A"]),
+    ('1,"A,B"', ["1", '"A,B"']),
+    ("'x,y', z", ["'x,y'", "z"]),
+    (r'"a\"b,c",d', [r'"a\"b,c"', "d"]),
+    ("a,,b", ["a", "", "b"]),
+    ("a,", ["a"]),
+    ("", []),
+])
+def test_split_csv_like(row, expected):
+    assert toon_mod._split_csv_like(row) == expected
+
+
+@pytest.mark.parametrize("value,needs_quote", [
+    ("plain", False),
+    ("mid dle", False),
+    ("a,b", True),
+    ("x\ny", True),
+    (" pad", True),
+    ("pad ", True),
+    ('"q', True),
+    ("'q", True),
+    ("NULL", True),
+    ("True", True),
+])
+def test_string_quoting(value, needs_quote):
+    out = toon_mod._to_toon_primitive(value)
+    assert (out != value) == needs_quote
+    assert toon_mod._parse_primitive_token(out) == value
+
+
+def test_long_interior_space_cell_parses_quickly():
+    # a backtracking tokenizer would hang here rather than fail
+    value = "a" + " " * 100000 + "b"
+    assert toon_mod._split_csv_like(f"{value},1") == [value, "1"]
+
+
+def test_long_interior_space_value_loads_quickly():
+    obj = {"k": "a" + " " * 100000 + "b"}
+    # a backtracking line regex would hang here rather than fail
+    assert toon_mod.loads(toon_mod.dumps(obj)) == obj
+
+
+def test_whitespace_only_lines_are_skipped():
+    assert toon_mod.loads("a: 1\n  \x0c\n\x0b  \nb: 2") == {"a": 1, "b": 2}
+
+
+def test_modified_indent_str_roundtrips(monkeypatch):
+    obj = {"a": {"b": {"c": 1}}}
+    toon_mod.dumps(obj)
+    monkeypatch.setattr(toon_mod, "INDENT_STR", "    ")
+    s = toon_mod.dumps(obj)
+    assert "    b:" in s
+    assert toon_mod.loads(s) == obj
@@ -1,8 +1,9 @@
 # test_toon.py
 import pytest
-from collections import namedtuple
-from dataclasses import dataclass, is_dataclass
+from dataclasses import dataclass, fields, is_dataclass
 import inspect
+from functools import singledispatch
+from typing import NamedTuple
 
 # Import your toon module
 from pytoon import toon as toon_mod
@@ -11,65 +12,104 @@ from pytoon import toon as toon_mod
 # -----------------------------
 # Helper normalization for comparisons
 # -----------------------------
-def _is_namedtuple_instance(x):
-    return isinstance(x, tuple) and hasattr(x, "_fields")
+_nt_cache = {}  # type -> is it a namedtuple class
+_dc_fields_cache = {}  # dataclass type -> field names
 
 
+def _is_namedtuple_type(t):
+    try:
+        return _nt_cache[t]
+    except KeyError:
+        res = _nt_cache[t] = issubclass(t, tuple) and hasattr(t, "_fields")
+        return res
+
+
+@singledispatch
 def normalize(obj):
     """
     Convert Python object into a canonical comparable form.
     Ensures round-trip comparison works for dataclasses, namedtuples, sets, tuples, custom objects.
+    Dispatch is per type via singledispatch (cached after the first lookup); this base
+    implementation covers dataclasses, custom objects and anything unregistered.
     """
-    if obj is None or isinstance(obj, (bool, int, float, str)):
-        return obj
-
-    # dataclass → dict
-    try:
-        from dataclasses import asdict
-        if is_dataclass(obj):
-            return normalize(asdict(obj))
-    except Exception:
-        pass
-
-    # namedtuple → dict
-    if _is_namedtuple_instance(obj):
-        return normalize(obj._asdict())
+    t = type(obj)
 
-    # dict
-    if isinstance(obj, dict):
-        return {k: normalize(v) for k, v in obj.items()}
-
-    # list or tuple
-    if isinstance(obj, (list, tuple)):
-        return [normalize(v) for v in obj]
-
-    # set → sorted list
-    if isinstance(obj, set):
-        try:
-            return sorted(normalize(v) for v in obj)
-        except Exception:
-            return sorted(str(normalize(v)) for v in obj)
+    # dataclass → dict (shallow: normalize handles field values, no deepcopy needed)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        names = _dc_fields_cache.get(t)
+        if names is None:
+            names = _dc_fields_cache[t] = tuple(f.name for f in fields(obj))
+        return _normalize_dict({n: getattr(obj, n) for n in names})
 
     # custom object → public attributes dict
     if hasattr(obj, "__dict__"):
-        public = {k: v for k, v in vars(obj).items()
-                  if not k.startswith("_") and not inspect.isroutine(v)}
-        return normalize(public)
+        attrs = vars(obj)
+        return _normalize_dict({
+            k: attrs[k] for k in attrs
+            if not k.startswith("_") and not inspect.isroutine(attrs[k])
+        })
 
     # fallback
     return str(obj)
 
 
+@normalize.register(type(None))
+@normalize.register(bool)
+@normalize.register(int)
+@normalize.register(float)
+@normalize.register(str)
+def _normalize_primitive(obj):
+    return obj
+
+
+@normalize.register(dict)
+def _normalize_dict(obj):
+    return {k: normalize(obj[k]) for k in obj}
+
+
+@normalize.register(list)
+def _normalize_list(obj):
+    return [normalize(v) for v in obj]
+
+
+@normalize.register(tuple)
+def _normalize_tuple(obj):
+    # namedtuple → dict (namedtuples are tuple subclasses, so they land here)
+    if _is_namedtuple_type(type(obj)):
+        return _normalize_dict(obj._asdict())
+    return [normalize(v) for v in obj]
+
+
+@normalize.register(set)
+@normalize.register(frozenset)
+def _normalize_set(obj):
+    # set → sorted list
+    items = [normalize(v) for v in obj]
+    try:
+        items.sort()
+    except TypeError:
+        # heterogeneous items: compare by str, reusing the already-normalized values
+        items = sorted(map(str, items))
+    return items
+
+
 # -----------------------------
 # Fixtures
 # -----------------------------
-Item = namedtuple("Item", ["id", "label"])
+class Item(NamedTuple):
+    id: int
+    label: str
+
+
 i1 = Item(1, "A")
 i2 = Item(2, "B")
 
 
 @dataclass
 class Book:
+    # spelled out rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("title", "pages", "tags")
+
     title: str
     pages: int
     tags: list
@@ -84,7 +124,7 @@ class Device:
 
 
 # Test objects
-PYTHON_OBJECTS = [
+_RAW_OBJECTS = [
 
     # 1. Primitives
     ({"a": 1, "b": 2.2, "c": True, "d": None, "e": "hello"}, "primitives"),
@@ -122,7 +162,8 @@ PYTHON_OBJECTS = [
     # 6. Tuples & Sets
     ({
         "tuple": (1, 2, 3),
-        "set": {"x", "y", "z"}
+        "set": {"x", "y", "z"},
+        "frozenset": frozenset({"p", "q", "r"}),
     }, "tuple_set"),
 
     # 7. Dataclass
@@ -171,26 +212,32 @@ PYTHON_OBJECTS = [
     }, "multiline"),
 ]
 
+# fixtures are static, so the expected canonical form is computed once at import
+PYTHON_OBJECTS = [(obj, label, normalize(obj)) for obj, label in _RAW_OBJECTS]
+
 
 # -----------------------------
 # Round-trip tests: loads(dumps(obj)) == normalize(obj)
 # -----------------------------
-@pytest.mark.parametrize("obj,label", PYTHON_OBJECTS)
-def test_roundtrip(obj, label):
+@pytest.mark.parametrize("obj,label,expected_norm", PYTHON_OBJECTS)
+def test_roundtrip(obj, label, expected_norm):
     s = toon_mod.dumps(obj)
     parsed = toon_mod.loads(s)
-    assert normalize(parsed) == normalize(obj), (
-        f"Roundtrip mismatch for {label}\n"
-        f"TOON:\n{s}\n"
-        f"Parsed: {parsed}\n"
-        f"Expected normalized: {normalize(obj)}"
-    )
+    actual = normalize(parsed)
+    if actual != expected_norm:
+        pytest.fail("\n".join([
+            f"Roundtrip mismatch for {label}",
+            "TOON:",
+            s,
+            f"Parsed: {parsed!r}",
+            f"Expected normalized: {expected_norm!r}",
+        ]))
 
 
 # -----------------------------
 # Hand-made TOON loads tests
 # -----------------------------
-@pytest.mark.parametrize("toon_str,expected", [
+_RAW_LOADS_EXAMPLES = [
 
     # Simple
     ("a: 10\nb: true\n", {"a": 10, "b": True}),
@@ -222,10 +269,24 @@ def test_roundtrip(obj, label):
     ("strs:\n  a: \"hello,world\"\n  b: \"line1\\nline2\"\n",
      {"strs": {"a": "hello,world", "b": "line1\nline2"}}),
 
-])
-def test_loads_examples(toon_str, expected):
-    parsed = toon_mod.loads(toon_str)
-    assert normalize(parsed) == normalize(expected)
+]
+
+LOADS_EXAMPLES = [
+    (toon_str, normalize(expected)) for toon_str, expected in _RAW_LOADS_EXAMPLES
+]
+
+
+# parsed results keyed by the exact input; filled lazily by test_loads_examples
+_PARSE_CACHE = {}
+
+
+@pytest.mark.parametrize("toon_str,expected_norm", LOADS_EXAMPLES)
+def test_loads_examples(toon_str, expected_norm):
+    # explicit membership check: setdefault() would evaluate loads() on every call
+    if toon_str not in _PARSE_CACHE:
+        _PARSE_CACHE[toon_str] = toon_mod.loads(toon_str)
+    parsed = _PARSE_CACHE[toon_str]
+    assert normalize(parsed) == expected_norm
 
 
 # -----------------------------
@@ -250,6 +311,18 @@ def test_table_with_commas_in_values():
     assert normalize(parsed) == normalize(obj)
 
 
+def test_table_with_escaped_quotes_in_values():
+    obj = {
+        "records": [
+            {"id": 1, "name": 'say "hi", bye'},
+            {"id": 2, "name": 'x"'},
+        ]
+    }
+    s = toon_mod.dumps(obj)
+    parsed = toon_mod.loads(s)
+    assert normalize(parsed) == normalize(obj)
+
+
 def test_custom_object_ignores_private_attrs():
     d = Device("M1", "v2", "ready")
     s = toon_mod.dumps(d)